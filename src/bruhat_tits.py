@@ -1,3 +1,5 @@
+import copy
+
 import networkx as nx
 import numpy as np
 from typing import Dict, Tuple
@@ -9,50 +11,78 @@ class BruhatTitsTree:
     CONJECTURAL: Assignment of negative edge weights to model 'broken' unitarity.
     """
     
-    def __init__(self, p: int = 2, depth: int = 5):
+    def __init__(self, p: int = 2, depth: int = 5, verbose: bool = True):
         """
         Args:
             p: prime number (each node except root will have degree p+1)
             depth: max tree depth from root
+            verbose: print a summary once the tree is built
         """
         self.p = p
         self.depth = depth
-        self.graph = nx.Graph()
-        self.node_level = {}
+        self.verbose = verbose
+        # Structure-of-arrays storage: edge e joins edge_u[e] -> edge_v[e] with weight edge_w[e]
+        self.edge_u = np.zeros(0, dtype=np.int64)
+        self.edge_v = np.zeros(0, dtype=np.int64)
+        self.edge_w = np.zeros(0, dtype=np.float64)
+        self.node_level = np.zeros(0, dtype=np.int32)
+        self._graph = None
         self.build()
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_level)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.edge_u)
+
+    @property
+    def graph(self) -> nx.Graph:
+        """
+        NetworkX view of the tree, materialized lazily (only needed for graph analysis).
+        Rebuilt after the edge weights change.
+        """
+        if self._graph is None:
+            graph = nx.Graph()
+            graph.add_nodes_from(range(self.num_nodes))
+            graph.add_weighted_edges_from(zip(self.edge_u.tolist(), self.edge_v.tolist(), self.edge_w.tolist()))
+            self._graph = graph
+        return self._graph
         
     def build(self):
-        """Builds a regular tree where every node has degree p+1 (root has p+1 children, others have p)."""
-        node_id_counter = 0
-        
-        # Root node
-        self.graph.add_node(node_id_counter)
-        self.node_level[node_id_counter] = 0
-        node_id_counter += 1
-        
-        # Queue for BFS: (parent_node_id, level)
-        queue = [(0, 0)]
-        
-        while queue:
-            parent_id, level = queue.pop(0)
-            
-            if level >= self.depth:
-                continue
-                
+        """
+        Builds a regular tree where every node has degree p+1 (root has p+1 children, others have p).
+        Nodes are numbered in BFS order, so each level occupies a contiguous id range
+        and the whole edge list can be generated level by level without a queue.
+        """
+        p, depth = self.p, self.depth
+
+        # Level sizes: 1, p+1, (p+1)p, (p+1)p^2, ...
+        level_sizes = np.array([1] + [(p + 1) * p ** (level - 1) for level in range(1, depth + 1)], dtype=np.int64)
+        level_start = np.concatenate(([0], np.cumsum(level_sizes)))
+        num_nodes = int(level_start[-1])
+
+        self.node_level = np.repeat(np.arange(depth + 1, dtype=np.int32), level_sizes)
+
+        # Edge e connects child node e+1 to its parent
+        edges = np.empty((num_nodes - 1, 2), dtype=np.int64)
+        for level in range(1, depth + 1):
             # Root has p+1 children, internal nodes have p children (degree = p+1)
-            num_children = self.p + 1 if parent_id == 0 else self.p
-            
-            for _ in range(num_children):
-                child_id = node_id_counter
-                node_id_counter += 1
-                
-                self.graph.add_node(child_id)
-                self.node_level[child_id] = level + 1
-                self.graph.add_edge(parent_id, child_id)
-                queue.append((child_id, level + 1))
-                
-        print(f"✓ Built Bruhat-Tits tree: p={self.p}, depth={self.depth}")
-        print(f"  Nodes: {self.graph.number_of_nodes()}, Edges: {self.graph.number_of_edges()}")
+            children_per_parent = p + 1 if level == 1 else p
+            parent_ids = np.arange(level_start[level - 1], level_start[level])
+            lo, hi = level_start[level] - 1, level_start[level + 1] - 1
+            edges[lo:hi, 0] = np.repeat(parent_ids, children_per_parent)
+            edges[lo:hi, 1] = np.arange(level_start[level], level_start[level + 1])
+
+        self.edge_u = edges[:, 0]
+        self.edge_v = edges[:, 1]
+        self.edge_w = np.zeros(num_nodes - 1, dtype=np.float64)
+        self._graph = None
+
+        if self.verbose:
+            print(f"✓ Built Bruhat-Tits tree: p={self.p}, depth={self.depth}")
+            print(f"  Nodes: {self.num_nodes}, Edges: {self.num_edges}")
 
     def assign_edge_weights_from_weil(self, p_contribution: float):
         """
@@ -61,27 +91,39 @@ class BruhatTitsTree:
         If W_p remains sufficiently positive -> physical tree, positive weights.
         If W_p becomes negative (due to resonance with a shifted zero) -> unitarity break, negative weights.
         """
-        for u, v in self.graph.edges():
-            base_weight = np.log(self.p)
-            
-            if p_contribution < 0:
-                # Broken state: edge weight becomes negative proportional to the fracture
-                weight = base_weight * p_contribution 
-            else:
-                # Healthy state
-                weight = base_weight
-                
-            self.graph[u][v]['weight'] = weight
+        # Every edge gets the same scalar: decide it once, then broadcast into edge_w
+        p_contribution = float(p_contribution)
+        base_weight = np.log(self.p)
+
+        if p_contribution < 0:
+            # Broken state: edge weight becomes negative proportional to the fracture
+            weight = base_weight * p_contribution
+        else:
+            # Healthy state
+            weight = base_weight
+
+        self.edge_w[:] = weight
+        self._graph = None
+
+    def with_weights(self, p_contribution: float) -> 'BruhatTitsTree':
+        """
+        Lightweight copy that shares this tree's topology (edge_u, edge_v, node_level)
+        but owns its edge weights, assigned from p_contribution. Avoids rebuilding the tree
+        when the same topology is needed under several weightings.
+        """
+        view = copy.copy(self)
+        view.edge_w = np.empty_like(self.edge_w)
+        view._graph = None
+        view.assign_edge_weights_from_weil(p_contribution)
+        return view
 
     def measure_unitarity_violation(self) -> float:
         """
         Returns fraction of negative edges.
         """
-        negative_count = sum(1 for u, v, w in self.graph.edges(data='weight', default=0) if w < 0)
-        total_edges = self.graph.number_of_edges()
-        if total_edges == 0:
+        if self.num_edges == 0:
             return 0.0
-        return negative_count / total_edges
+        return np.count_nonzero(self.edge_w < 0) / self.num_edges
 
     def visualize(self, filename: str = "tree.html"):
         """
@@ -90,53 +132,32 @@ class BruhatTitsTree:
         """
         import plotly.graph_objects as go
         
-        pos = self._compute_layout()
-        
-        edge_x, edge_y, edge_colors = [], [], []
-        
-        for u, v in self.graph.edges():
-            x0, y0 = pos[u]
-            x1, y1 = pos[v]
-            
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
-            
-            weight = self.graph[u][v].get('weight', 0)
-            color = 'red' if weight < 0 else 'gray'
-            edge_colors.append(color)
-            
-        node_x = [pos[n][0] for n in self.graph.nodes()]
-        node_y = [pos[n][1] for n in self.graph.nodes()]
-        node_colors = [self.node_level.get(n, 0) for n in self.graph.nodes()]
-        
+        x, y = self._layout_xy()
+
+        def segments(mask):
+            # One (x_u, x_v, NaN) triple per edge: NaN breaks the polyline between edges,
+            # so a whole edge class is a single line trace built without a Python loop.
+            u, v = self.edge_u[mask], self.edge_v[mask]
+            gap = np.full(u.size, np.nan)
+            return np.column_stack((x[u], x[v], gap)).ravel(), np.column_stack((y[u], y[v], gap)).ravel()
+
         fig = go.Figure()
         
-        # We add traces per edge individually to color them, or just use one color if not supported
-        # Plotly doesn't easily support multi-color Line traces seamlessly without splitting.
-        # So we'll iterate edges and add them to figure, or split by color
-        
-        edges_pos = [(u, v) for u, v in self.graph.edges() if self.graph[u][v].get('weight', 0) >= 0]
-        edges_neg = [(u, v) for u, v in self.graph.edges() if self.graph[u][v].get('weight', 0) < 0]
-
-        def get_lines(edge_list):
-            ex, ey = [], []
-            for u, v in edge_list:
-                ex.extend([pos[u][0], pos[v][0], None])
-                ey.extend([pos[u][1], pos[v][1], None])
-            return ex, ey
-            
-        x_pos, y_pos = get_lines(edges_pos)
-        x_neg, y_neg = get_lines(edges_neg)
+        # Plotly doesn't support per-segment colors in a single line trace,
+        # so edges are split by sign into two traces
+        negative = self.edge_w < 0
+        x_pos, y_pos = segments(~negative)
+        x_neg, y_neg = segments(negative)
         
-        if x_pos:
-            fig.add_trace(go.Scatter(x=x_pos, y=y_pos, mode='lines', line=dict(width=1, color='gray'), hoverinfo='none', name='Positive (Healthy)'))
-        if x_neg:
-            fig.add_trace(go.Scatter(x=x_neg, y=y_neg, mode='lines', line=dict(width=2, color='red'), hoverinfo='none', name='Negative (Broken)'))
-
-        fig.add_trace(go.Scatter(
-            x=node_x, y=node_y, mode='markers',
-            marker=dict(size=8, color=node_colors, colorscale='Viridis', showscale=True, colorbar=dict(title="Level")),
-            hovertext=[f"Node {n}, Level {self.node_level[n]}" for n in self.graph.nodes()], hoverinfo='text', name='Nodes'
+        if x_pos.size:
+            fig.add_trace(go.Scattergl(x=x_pos, y=y_pos, mode='lines', line=dict(width=1, color='gray'), hoverinfo='none', name='Positive (Healthy)'))
+        if x_neg.size:
+            fig.add_trace(go.Scattergl(x=x_neg, y=y_neg, mode='lines', line=dict(width=2, color='red'), hoverinfo='none', name='Negative (Broken)'))
+
+        fig.add_trace(go.Scattergl(
+            x=x, y=y, mode='markers',
+            marker=dict(size=8, color=self.node_level, colorscale='Viridis', showscale=True, colorbar=dict(title="Level")),
+            hovertext=[f"Node {n}, Level {level}" for n, level in enumerate(self.node_level.tolist())], hoverinfo='text', name='Nodes'
         ))
         
         fig.update_layout(title=f"Bruhat-Tits Tree (p={self.p}, depth={self.depth})", hovermode='closest', showlegend=True)
@@ -144,10 +165,24 @@ class BruhatTitsTree:
         print(f"✓ Saved tree visualization to {filename}")
 
     def _compute_layout(self) -> Dict[int, Tuple[float, float]]:
-        """A simple hierarchical layout heuristic."""
-        try:
-            # Requires Graphviz/PyGraphviz for actual tree layout in nx,
-            # But we can write a manual BFS-based grid layout or use Kamada-Kawai if graph is small
-            return nx.kamada_kawai_layout(self.graph)
-        except:
-            return nx.spring_layout(self.graph)
+        """Node id -> (x, y) mapping of the hierarchical layout from _layout_xy."""
+        x, y = self._layout_xy()
+        return dict(enumerate(zip(x.tolist(), y.tolist())))
+
+    def _layout_xy(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hierarchical layout: a node at level L is placed at (x, -L), where x spreads the
+        nodes of that level evenly over [0, 1] in id (BFS) order. Closed form, O(N).
+        Returns the x and y coordinate arrays indexed by node id.
+        """
+        levels = self.node_level
+        counts = np.bincount(levels)
+
+        # Rank of each node within its level (stable sort keeps id order inside a level)
+        order = np.argsort(levels, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        x = (rank + 0.5) / counts[levels]
+        y = (-levels).astype(np.float64)
+        return x, y
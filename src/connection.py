@@ -1,11 +1,48 @@
+import bisect
 import math
+import multiprocessing
+import os
 import mpmath
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict
 
 from weil_functional import WeilFunctional
+from weil_primes import PrimesContribution
 from bruhat_tits import BruhatTitsTree
 
 
+# Per-process state for the robustness sweep's pool workers, shipped once to each
+# worker by the pool initializer instead of being pickled with every task.
+_sweep_state = {}
+
+
+def _init_sweep_worker(dps, gammas, primes, log_p, sqrt_p):
+    mpmath.mp.dps = dps
+    _sweep_state.update(gammas=gammas, primes=primes, log_p=log_p, sqrt_p=sqrt_p)
+
+
+def _sweep_worker(sigma, num_primes):
+    """Pool task: _sweep_point on the tables held by this worker's _sweep_state."""
+    return _sweep_point(sigma, num_primes, **_sweep_state)
+
+
+def _sweep_point(sigma, num_primes, gammas, primes, log_p, sqrt_p):
+    """W(f) identity error for one sigma, using the prefix of the prime tables below num_primes."""
+    k = bisect.bisect_left(primes, num_primes)
+    # log_p / sqrt_p are None when the MPFR kernel computes them itself
+    w_total, components = WeilFunctional.compute_cached(
+        gammas,
+        sigma=mpmath.mpf(sigma),
+        num_primes=num_primes,
+        primes=primes[:k],
+        log_p=log_p[:k] if log_p is not None else None,
+        sqrt_p=sqrt_p[:k] if sqrt_p is not None else None,
+        verbose=False
+    )
+    return float(components['identity_error'])
+
+
 class WeilGraphConnection:
     """
     Explores the connection between Weil Functional properties and p-adic tree unitarity.
@@ -63,20 +100,35 @@ class WeilGraphConnection:
 
         min_w = None
 
-        for sigma in sigma_values:
-            # Dynamically calculate the prime cutoff
-            allocated_primes = int(10000 * sigma) # Будет 1000, 2000, 3000...
-
-            req_primes = WeilGraphConnection.calculate_required_primes(sigma)
-            print(f"Testing sigma = {sigma} (Allocating {allocated_primes} primes)...")
-            
-            w_total, components = WeilFunctional.compute(
-                gammas, 
-                sigma=mpmath.mpf(sigma), 
-                num_primes=allocated_primes, 
-                verbose=False
-            )
-            w_float = float(components['identity_error']) 
+        if not sigma_values:
+            results['min_w'] = min_w
+            return results
+
+        # Dynamically calculate the prime cutoff of each sigma
+        allocated_primes = [int(10000 * sigma) for sigma in sigma_values] # Будет 1000, 2000, 3000...
+
+        # Build the prime, log p and sqrt p tables once for the largest cutoff;
+        # each sigma then uses the prefix below its own cutoff.
+        primes, log_p, sqrt_p = PrimesContribution.prime_tables(max(allocated_primes),
+                                                                with_logs=not PrimesContribution.uses_mpfr())
+
+        # Every sigma is independent, so the mpmath evaluations run in a process pool.
+        # The FP64 path (dps <= 15) is fast enough that pool start-up would dominate.
+        # Workers are spawned, not forked: forking once Numba's parallel kernels have
+        # started their TBB threads leaves the parent hanging at exit.
+        num_workers = min(len(sigma_values), os.cpu_count() or 1)
+        if num_workers > 1 and mpmath.mp.dps > 15:
+            with ProcessPoolExecutor(max_workers=num_workers,
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_sweep_worker,
+                                     initargs=(mpmath.mp.dps, gammas, primes, log_p, sqrt_p)) as executor:
+                w_values = list(executor.map(_sweep_worker, sigma_values, allocated_primes))
+        else:
+            w_values = [_sweep_point(sigma, n, gammas, primes, log_p, sqrt_p)
+                        for sigma, n in zip(sigma_values, allocated_primes)]
+
+        for sigma, num_primes, w_float in zip(sigma_values, allocated_primes, w_values):
+            print(f"Testing sigma = {sigma} (Allocating {num_primes} primes)...")
 
             results['sigma_values'].append(sigma)
             results['w_values'].append(w_float)
@@ -116,7 +168,9 @@ class WeilGraphConnection:
         w_total_ideal, components_ideal = WeilFunctional.compute(
             gammas, sigma=sigma, num_primes=num_primes, verbose=False
         )
-        p_ideal = components_ideal['p_contributions']
+        # Per-prime contributions W_p^{ideal}, aligned with the int64 array of primes
+        primes_arr = components_ideal['primes']
+        w_ideal = components_ideal['p_contributions']
 
         # Shift the first zero (gamma_1 = 14.1347...) by +0.1i
         gamma_1_ideal = gammas[0]
@@ -130,53 +184,48 @@ class WeilGraphConnection:
         shift = 0.1j
         gamma_1_broken = gammas_broken[0] + shift
 
-        sigma_mpf = mpmath.mpf(sigma)
-        def f(u):
-            u = mpmath.mpf(u)
-            return mpmath.exp(-(u / (2 * sigma_mpf)) ** 2)
+        # p^{i gamma'} = p^{i gamma} * p^{-Im(shift)}: both waves share the phase gamma*log p,
+        # so Re[wave_broken - wave_ideal] = (p^{-Im(shift)} - 1) * cos(gamma*log p).
+        # Delta_p ends up as a float, so every per-prime factor is tabulated once in FP64.
+        primes = primes_arr.tolist()
+        log_p = np.log(primes_arr)
+        sqrt_p = np.sqrt(primes_arr)
+        f_vals = np.exp(-(log_p / (2 * float(sigma))) ** 2)
 
-        results = {}
-        max_delta = -1
-        resonance_prime = None
-        
-        for p, w_ideal in p_ideal.items():
-            p_mpf = mpmath.mpf(p)
-            log_p = mpmath.log(p_mpf)
-            
-            # Theoretical projection of the broken zero on the prime p
-            wave_ideal = p_mpf ** (mpmath.j * gamma_1_ideal)
-            wave_broken = p_mpf ** (mpmath.j * gamma_1_broken)
-            
-            # Error distribution on prime p according to the Duality
-            delta_p_complex = (wave_broken - wave_ideal) * (log_p / mpmath.sqrt(p_mpf)) * f(log_p)
-            delta_p = float(mpmath.re(delta_p_complex))
-            
-            w_broken = w_ideal + delta_p
-            
-            results[p] = {
-                'w_ideal': w_ideal,
-                'w_broken': w_broken,
+        amp_broken = np.exp(-float(mpmath.im(gamma_1_broken)) * log_p)
+        wave_ideal_re = np.cos(float(gamma_1_ideal) * log_p)
+
+        # Error distribution on prime p according to the Duality
+        deltas = (amp_broken - 1) * wave_ideal_re * (log_p / sqrt_p) * f_vals
+        w_broken = w_ideal + deltas
+
+        results = {
+            p: {
+                'w_ideal': w_i,
+                'w_broken': w_b,
                 'delta': delta_p
             }
-            
-            if abs(delta_p) > max_delta:
-                max_delta = abs(delta_p)
-                resonance_prime = p
+            for p, w_i, w_b, delta_p in zip(primes, w_ideal.tolist(), w_broken.tolist(), deltas.tolist())
+        }
+
+        # The resonance prime experiences the largest |Delta_p| (first one on ties)
+        idx = int(np.argmax(np.abs(deltas)))
+        resonance_prime = primes[idx]
+        max_delta = abs(float(deltas[idx]))
 
         print(f"Shifted gamma_1 from {gamma_1_ideal} to {gamma_1_broken}")
         print(f"Discovered Resonance Prime: p = {resonance_prime} (Max Delta = {max_delta:.6e})")
 
-        # Build trees for the resonance prime
-        tree_healthy = BruhatTitsTree(p=resonance_prime, depth=3)
-        tree_healthy.assign_edge_weights_from_weil(results[resonance_prime]['w_ideal'])
+        # Build the tree for the resonance prime once; healthy and broken share its topology
+        tree = BruhatTitsTree(p=resonance_prime, depth=3, verbose=False)
+        tree_healthy = tree.with_weights(results[resonance_prime]['w_ideal'])
         
         # We artificially magnify the breakage for the toy model visualization if w_broken isn't strictly negative
         w_broken_viz = results[resonance_prime]['w_broken']
         if w_broken_viz > 0:
             w_broken_viz = -abs(w_broken_viz) - 1.0
             
-        tree_broken = BruhatTitsTree(p=resonance_prime, depth=3)
-        tree_broken.assign_edge_weights_from_weil(w_broken_viz)
+        tree_broken = tree.with_weights(w_broken_viz)
 
         return {
             'prime_data': results,
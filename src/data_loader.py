@@ -1,9 +1,11 @@
 import json
 import os
+import pickle
 import urllib.request
 from typing import List
 
 import mpmath
+import numpy as np
 
 
 class RiemannZerosLoader:
@@ -14,6 +16,8 @@ class RiemannZerosLoader:
     """
 
     CACHE_FILE = "../data/riemann_zeros_cache.json"
+    # Directory holding the zeros caches and the local zeta_zeros.txt table
+    DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
 
     @staticmethod
     def fetch_odlyzko_from_web(num_zeros: int) -> List[mpmath.mpf]:
@@ -23,68 +27,81 @@ class RiemannZerosLoader:
         """
         # Odlyzko's table zeros1 contains 100,000 zeros.
         url = "http://www.dtc.umn.edu/~odlyzko/zeta_tables/zeros1"
+        gammas = []
         try:
             print(f"Fetching zeros from {url}...")
             req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
             with urllib.request.urlopen(req) as response:
-                content = response.read().decode('utf-8')
-                
+                # Stream line by line and stop as soon as enough zeros are parsed,
+                # instead of downloading and splitting the whole table.
+                for raw_line in response:
+                    line = raw_line.decode('utf-8').strip()
+                    if not line:
+                        continue
+
+                    # Safe parsing
+                    try:
+                        # Get the last token in case there are prefixes or indices
+                        val_str = line.split()[-1]
+                        val = mpmath.mpf(val_str)
+                        gammas.append(val)
+                    except ValueError:
+                        continue
+
+                    if len(gammas) >= num_zeros:
+                        break
+
         except Exception as e:
             print(f"Error fetching from web: {e}")
             return []
 
-        gammas = []
-        for line in content.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Safe parsing
-            try:
-                # Get the last token in case there are prefixes or indices
-                val_str = line.split()[-1]
-                val = mpmath.mpf(val_str)
-                gammas.append(val)
-            except ValueError:
-                continue
-                
-            if len(gammas) >= num_zeros:
-                break
-                
         return gammas
 
     @staticmethod
     def load_odlyzko(num_zeros: int = 100000, dps: int = 50) -> List[mpmath.mpf]:
         """
         Loads from Odlyzko.
-        Tries SageMath first, then cached JSON, then local text file / web.
+        Tries the binary cache first, then the legacy JSON cache, SageMath, local text file / web.
         
         Args:
             num_zeros: How many zeros to load (gamma_n)
             dps: Decimal places for high-precision arithmetic
 
         Returns:
-            List of gamma_n as mpmath.mpf
+            List of gamma_n as mpmath.mpf, ascending
         """
+        # ZerosContribution.compute cuts its sum off by bisection, so the zeros are sorted once here
+        return sorted(RiemannZerosLoader._load_odlyzko(num_zeros, dps))
+
+    @staticmethod
+    def _load_odlyzko(num_zeros: int, dps: int) -> List[mpmath.mpf]:
         mpmath.mp.dps = dps
         
-        # Determine paths relative to this script
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        cache_path = os.path.join(base_dir, "data", "riemann_zeros.json")
-        txt_path = os.path.join(base_dir, "data", "zeta_zeros.txt")
+        data_dir = RiemannZerosLoader.DATA_DIR
+        cache_path = os.path.join(data_dir, "riemann_zeros")
+        json_cache_path = os.path.join(data_dir, "riemann_zeros.json")
+        txt_path = os.path.join(data_dir, "zeta_zeros.txt")
+
+        # 1. Try binary cache: FP64 array when double precision is enough, raw mpf tuples otherwise
+        gammas = RiemannZerosLoader._load_cache(cache_path, num_zeros, dps)
+        if gammas is not None:
+            print(f"Loaded {num_zeros} zeros from cache.")
+            return gammas
 
-        # 1. Try JSON Cache
-        if os.path.exists(cache_path):
+        # 2. Try legacy JSON cache (deprecated, migrated to the binary format on read)
+        if os.path.exists(json_cache_path):
             try:
-                with open(cache_path, 'r') as f:
+                with open(json_cache_path, 'r') as f:
                     data = json.load(f)
                     if len(data) >= num_zeros:
-                        print(f"Loaded {num_zeros} zeros from cache.")
-                        return [mpmath.mpf(val) for val in data[:num_zeros]]
+                        print(f"Loaded {num_zeros} zeros from legacy JSON cache.")
+                        gammas = [mpmath.mpf(val) for val in data]
+                        RiemannZerosLoader._save_cache(gammas, cache_path)
+                        return gammas[:num_zeros]
             except Exception as e:
                 print(f"Failed to read cache: {e}")
 
-        # 2. Try SageMath
+        # 3. Try SageMath
         try:
             from sage.databases.odlyzko import zeta_zeros
             print("Using SageMath to load zeros...")
@@ -95,7 +112,7 @@ class RiemannZerosLoader:
         except ImportError:
             pass
 
-        # 3. Try Local File `zeta_zeros.txt`
+        # 4. Try Local File `zeta_zeros.txt`
         gammas = []
         if os.path.exists(txt_path):
             try:
@@ -110,22 +127,45 @@ class RiemannZerosLoader:
             except Exception as e:
                 print(f"Failed to read local text file: {e}")
 
-        # 4. Fetch from Web if file didn't exist or didn't have enough
+        # 5. Fetch from Web if file didn't exist or didn't have enough
         if len(gammas) < num_zeros:
             gammas = RiemannZerosLoader.fetch_odlyzko_from_web(num_zeros)
 
-        # 5. Save Cache if successful
+        # 6. Save Cache if successful
         if len(gammas) > 0:
             RiemannZerosLoader._save_cache(gammas, cache_path)
             
         return gammas[:num_zeros]
 
+    @staticmethod
+    def _load_cache(cache_path: str, num_zeros: int, dps: int):
+        """
+        Reads `<cache_path>.npy` (FP64, used when dps <= 15) or `<cache_path>_hp.pkl`
+        (pickled mpf._mpf_ tuples). Returns None if no cache holds enough zeros.
+        """
+        npy_path = cache_path + ".npy"
+        hp_path = cache_path + "_hp.pkl"
+        try:
+            if dps <= 15 and os.path.exists(npy_path):
+                data = np.load(npy_path, mmap_mode='r')
+                if len(data) >= num_zeros:
+                    return [mpmath.mpf(val) for val in data[:num_zeros].tolist()]
+
+            if os.path.exists(hp_path):
+                with open(hp_path, 'rb') as f:
+                    data = pickle.load(f)
+                if len(data) >= num_zeros:
+                    return [mpmath.mpf(val) for val in data[:num_zeros]]
+        except Exception as e:
+            print(f"Failed to read cache: {e}")
+        return None
+
     @staticmethod
     def _save_cache(gammas: List[mpmath.mpf], cache_path: str):
         try:
-            data_to_save = [str(g) for g in gammas]
-            with open(cache_path, 'w') as f:
-                json.dump(data_to_save, f)
+            np.save(cache_path + ".npy", np.array([float(g) for g in gammas], dtype=np.float64))
+            with open(cache_path + "_hp.pkl", 'wb') as f:
+                pickle.dump([g._mpf_ for g in gammas], f, protocol=pickle.HIGHEST_PROTOCOL)
             print(f"Saved {len(gammas)} zeros to cache.")
         except Exception as e:
             print(f"Failed to write cache: {e}")
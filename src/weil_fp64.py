@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+
+# Numba is optional: without it the kernels below still run as plain Python,
+# and PrimesContribution.compute_gaussian falls back to the NumPy grid version instead.
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def gaussian_u_cutoff(sigma, neg_log_tol):
+    """
+    Largest u = m log p at which p^(-m/2) * f(m log p) = exp(-u/2 - (u / 2*sigma)^2) is still
+    >= tol = exp(-neg_log_tol): the positive root of u^2 + 2 sigma^2 u - 4 sigma^2 neg_log_tol = 0.
+    Terms decrease in m, so the sum over m can stop at m = floor(u / log p) + 1.
+    """
+    s2 = sigma * sigma
+    return -s2 + math.sqrt(s2 * s2 + 4.0 * s2 * neg_log_tol)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def primes_sum_gaussian(log_p, sigma, tol):
+    """
+    Double-precision prime side of the Weil functional for the Gaussian test function
+    f(u) = exp(-(u / 2*sigma)^2):
+        W_p = log p * sum_m p^(-m/2) * (f(m log p) + f(-m log p)) / 2
+
+    Args:
+        log_p: float64 array of log p (see PrimesContribution.prime_tables)
+        sigma: Gaussian width
+        tol: the inner sum over m is cut off analytically where its terms drop below tol
+
+    Returns:
+        (total, per-prime contributions W_p as a float64 array)
+    """
+    n = log_p.shape[0]
+    contributions = np.empty(n, dtype=np.float64)
+    # Cut where p^(-m/2) f(m log p), the term after the halving, drops below tol,
+    # the same bound the mpmath and MPFR loops use
+    u_max = gaussian_u_cutoff(sigma, -math.log(tol))
+
+    for i in prange(n):
+        lp = log_p[i]
+        inner_sum = 0.0
+        m_max = min(99, int(u_max / lp) + 1)
+
+        for m in range(1, m_max + 1):
+            u = m * lp
+            # p^(-m/2) = exp(-u/2); f is even, so f(u) + f(-u) = 2 f(u)
+            inner_sum += 2.0 * math.exp(-0.5 * u - (u / (2.0 * sigma)) ** 2)
+
+        contributions[i] = lp * (inner_sum / 2.0)
+
+    return contributions.sum(), contributions
+
+
+def primes_sum_gaussian_np(log_p, sigma, tol, max_m=99):
+    """
+    NumPy version of primes_sum_gaussian for when Numba is unavailable.
+    All (m, p) terms are evaluated at once on the np.outer(m, log p) grid, masked past each
+    prime's analytic cutoff; the grid only has as many rows as the smallest prime needs.
+    """
+    log_p = np.asarray(log_p, dtype=np.float64)
+    if log_p.size == 0:
+        return 0.0, np.zeros(0)
+
+    u_max = gaussian_u_cutoff(sigma, -math.log(tol))
+    m_max = np.minimum(max_m, np.floor(u_max / log_p) + 1)
+    m = np.arange(1, int(m_max.max()) + 1, dtype=np.float64)
+
+    u = np.outer(m, log_p)
+    terms = 2.0 * np.exp(-0.5 * u - (u / (2.0 * sigma)) ** 2)
+    terms[m[:, None] > m_max] = 0.0
+
+    contributions = log_p * (terms.sum(axis=0) / 2.0)
+    return contributions.sum(), contributions
@@ -1,8 +1,20 @@
+import functools
+import hashlib
+from collections import OrderedDict
+
 import mpmath
+import numpy as np
 from weil_archimedean import ArchimideanTerm
 from weil_zeros import ZerosContribution
 from weil_primes import PrimesContribution
 
+@functools.lru_cache(maxsize=None)
+def _sqrt_pi(prec: int) -> mpmath.mpf:
+    """sqrt(pi) at the given binary precision, evaluated once per precision."""
+    with mpmath.workprec(prec):
+        return mpmath.sqrt(mpmath.pi)
+
+
 class WeilFunctional:
     """
     Computes the full Weil explicit formula functional:
@@ -12,20 +24,97 @@ class WeilFunctional:
     @staticmethod
     def gaussian_testfunc(sigma: mpmath.mpf = 1):
         sigma = mpmath.mpf(sigma)
+        # Invariants of the closures, evaluated once per sigma instead of on every call
+        inv_two_sigma = 1 / (2 * sigma)
+        prefactor = 2 * sigma * _sqrt_pi(mpmath.mp.prec)
 
         def f(u):
-            u = mpmath.mpf(u)
-            return mpmath.exp(-(u / (2 * sigma)) ** 2)
+            return mpmath.exp(-(u * inv_two_sigma) ** 2)
 
         def f_hat(t):
-            t = mpmath.mpf(t)
             # ПРАВИЛЬНЫЙ Фурье-образ с множителем 2
-            return 2 * sigma * mpmath.sqrt(mpmath.pi) * mpmath.exp(-(sigma * t) ** 2)
+            return prefactor * mpmath.exp(-(sigma * t) ** 2)
+
+        return f, f_hat
+
+    @staticmethod
+    def gaussian_testfunc_np(sigma: float = 1):
+        """NumPy (FP64) counterparts of gaussian_testfunc, vectorized over arrays."""
+        sigma = float(sigma)
+        prefactor = 2 * sigma * np.sqrt(np.pi)
+
+        def f(u):
+            return np.exp(-(u / (2 * sigma)) ** 2)
+
+        def f_hat(t):
+            return prefactor * np.exp(-(sigma * t) ** 2)
 
         return f, f_hat
 
+    # (zeros digest, sigma, num_primes, precision) -> (w_total, components), least recently used first
+    _results_cache = OrderedDict()
+    _RESULTS_CACHE_SIZE = 16
+
+    @staticmethod
+    def _cache_key(gammas, sigma, num_primes):
+        return (WeilFunctional._zeros_digest(gammas), mpmath.mpf(sigma)._mpf_, num_primes, mpmath.mp.prec)
+
+    @staticmethod
+    def _zeros_digest(gammas) -> bytes:
+        """
+        Fixed-size digest that tells lists of zeros apart anywhere: blake2b over the count and
+        the FP64 bytes of a NumPy array, or the exact raw _mpf_ tuple of every other zero.
+        """
+        digest = hashlib.blake2b(str(len(gammas)).encode(), digest_size=16)
+        if isinstance(gammas, np.ndarray):
+            digest.update(np.ascontiguousarray(gammas, dtype=np.float64).tobytes())
+        else:
+            mpf_tuples = [g._mpf_ if isinstance(g, mpmath.mpf) else mpmath.mpf(g)._mpf_ for g in gammas]
+            digest.update(repr(mpf_tuples).encode())
+        return digest.digest()
+
+    @staticmethod
+    def clear_cache():
+        WeilFunctional._results_cache.clear()
+
     @staticmethod
     def compute(gammas, sigma=1, num_primes=500, verbose=True):
+        """
+        Results are memoized per (zeros, sigma, num_primes, precision), so repeated
+        evaluations across the experiments and the dashboard are computed once;
+        the _RESULTS_CACHE_SIZE most recently used results are kept.
+        The 'primes' and 'p_contributions' arrays are shared with the cache and read-only.
+        """
+        key = WeilFunctional._cache_key(gammas, sigma, num_primes)
+        cached = WeilFunctional._results_cache.get(key)
+        if cached is not None:
+            WeilFunctional._results_cache.move_to_end(key)
+            if verbose:
+                print(f"Using cached Weil functional (sigma={float(sigma)}, num_primes={num_primes})")
+            w_total, components = cached
+            return w_total, dict(components)
+
+        # The MPFR prime kernel only reads the primes
+        with_logs = not PrimesContribution.uses_mpfr()
+        primes, log_p, sqrt_p = PrimesContribution.prime_tables(num_primes, with_logs=with_logs)
+        w_total, components = WeilFunctional.compute_cached(gammas, sigma, num_primes, primes, log_p, sqrt_p,
+                                                            verbose=verbose)
+        for name in ('primes', 'p_contributions'):
+            components[name] = components[name].copy()
+            components[name].flags.writeable = False
+
+        WeilFunctional._results_cache[key] = (w_total, components)
+        if len(WeilFunctional._results_cache) > WeilFunctional._RESULTS_CACHE_SIZE:
+            WeilFunctional._results_cache.popitem(last=False)
+        return w_total, dict(components)
+
+    @staticmethod
+    def compute_cached(gammas, sigma, num_primes, primes, log_p, sqrt_p, verbose=False):
+        """
+        Same as compute(), but takes the (primes, log_p, sqrt_p) tables for the primes
+        p < num_primes from PrimesContribution.prime_tables() instead of regenerating them,
+        so a sigma sweep can build them once.
+        """
         sigma = mpmath.mpf(sigma)
 
         if verbose:
@@ -34,25 +123,23 @@ class WeilFunctional:
             print(f"Sigma: {sigma}, Precision (dps): {mpmath.mp.dps}")
             print("=" * 60)
 
-        f, f_hat = WeilFunctional.gaussian_testfunc(sigma)
+        _, f_hat = WeilFunctional.gaussian_testfunc(sigma)
 
-        # 1. Zeros (Спектр) - теперь f_hat правильный, поэтому внутри Zeros просто суммируем f_hat
-        w_zeros = mpmath.mpf(0)
-        for g in gammas:
-            gamma = mpmath.mpf(g)
-            # Сумма по +gamma и -gamma
-            w_zeros += 2 * f_hat(gamma)
+        # 1. Zeros (Спектр) - сумма f_hat по +gamma и -gamma
+        w_zeros = ZerosContribution.compute(gammas, sigma)
 
         # 2. Archimedean (Передаем f_hat)
-        w_arch = ArchimideanTerm.compute(f_hat)
+        _, f_hat_np = WeilFunctional.gaussian_testfunc_np(sigma)
+        w_arch = ArchimideanTerm.compute(f_hat, f_hat_np=f_hat_np)
 
         # 3. Primes (Ожидаем кортеж)
-        w_primes, p_contributions = PrimesContribution.compute(f, num_primes)
+        w_primes, primes_arr, p_contributions = PrimesContribution.compute_gaussian(sigma, primes=primes, log_p=log_p,
+                                                                                   sqrt_p=sqrt_p)
 
         # 4. Poles: f_hat(i/2) + f_hat(-i/2)
         # f_hat(i/2) = 2 * sigma * sqrt(pi) * exp(sigma^2 / 4)
         # Сумма для i/2 и -i/2 дает удвоение:
-        w_poles = 4 * sigma * mpmath.sqrt(mpmath.pi) * mpmath.exp((sigma**2) / 4)
+        w_poles = 4 * sigma * _sqrt_pi(mpmath.mp.prec) * mpmath.exp(sigma * sigma / 4)
 
         # 5. Баланс (Геометрия)
         w_geom = w_poles - w_arch - w_primes
@@ -78,6 +165,7 @@ class WeilFunctional:
             'W_zeros': w_zeros,
             'W_primes': w_primes,
             'W_poles': w_poles,
+            'primes': primes_arr,
             'p_contributions': p_contributions,
             'W_total': w_total,
             'identity_error': identity_error,
@@ -0,0 +1,75 @@
+import math
+
+import mpmath
+import numpy as np
+
+from weil_fp64 import gaussian_u_cutoff
+
+# gmpy2 is optional: without it PrimesContribution.compute_gaussian keeps its mpmath loop.
+try:
+    import gmpy2
+    HAVE_GMPY2 = True
+except ImportError:
+    gmpy2 = None
+    HAVE_GMPY2 = False
+
+
+def _to_mpfr(x):
+    """Exact mpmath.mpf -> gmpy2.mpfr conversion through the raw (sign, man, exp) triple."""
+    sign, man, exp, _ = mpmath.mpf(x)._mpf_
+    man = gmpy2.mpfr(-man if sign else man)
+    # gmpy2 < 2.2 only takes a non-negative shift in mul_2exp
+    return gmpy2.mul_2exp(man, exp) if exp >= 0 else gmpy2.div_2exp(man, -exp)
+
+
+def _to_mpf(x):
+    """Exact gmpy2.mpfr -> mpmath.mpf conversion through the mantissa and exponent."""
+    man, exp = x.as_mantissa_exp()
+    return mpmath.mpf((int(man), int(exp)))
+
+
+def primes_sum_gaussian(primes, sigma, prec, dps):
+    """
+    MPFR version of the mpmath loop in PrimesContribution.compute_gaussian for the Gaussian test
+    function f(u) = exp(-(u / 2*sigma)^2):
+        W_p = log p * sum_m p^(-m/2) * f(m log p)
+
+    Args:
+        primes: the primes p (see PrimesContribution.prime_tables)
+        sigma: Gaussian width (mpmath.mpf, converted exactly)
+        prec: working precision in bits (mpmath.mp.prec)
+        dps: decimal digits of the sum; the inner sum over m is cut off where its terms drop below 10^-dps
+
+    Returns:
+        (total as mpmath.mpf, per-prime contributions W_p as a float64 array)
+    """
+    contributions = np.empty(len(primes), dtype=np.float64)
+    # Terms p^(-m/2) f(m log p) stay >= 10^-dps only up to m log p = u_max
+    u_max = gaussian_u_cutoff(float(sigma), dps * math.log(10))
+
+    with gmpy2.context(precision=prec):
+        inv_two_sigma = 1 / (2 * _to_mpfr(sigma))
+        prime_terms = []
+
+        for i, p in enumerate(primes):
+            # MPFR log and reciprocal square root are cheap enough to skip the mpf tables
+            log_p = gmpy2.log(int(p))
+            inv_sqrt_p = gmpy2.rec_sqrt(int(p))
+            m_max = min(99, int(u_max / float(log_p)) + 1)
+
+            p_power = gmpy2.mpfr(1)
+            u = gmpy2.mpfr(0)
+            terms = []
+
+            for m in range(1, m_max + 1):
+                p_power *= inv_sqrt_p
+                u += log_p
+                terms.append(p_power * gmpy2.exp(-(u * inv_two_sigma) ** 2))
+
+            prime_term = log_p * gmpy2.fsum(terms)
+            prime_terms.append(prime_term)
+            contributions[i] = float(prime_term)
+
+        total = _to_mpf(gmpy2.fsum(prime_terms))
+
+    return total, contributions
@@ -1,33 +1,270 @@
+import bisect
+import functools
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import mpmath
-from sympy import primerange
-from typing import Callable, Tuple, Dict
+import numpy as np
+from typing import Callable, Tuple, List, Optional, Sequence
+
+import weil_fp64
+import weil_mpfr
+
+# Primes found so far by the sieve, and the bound they are complete up to (exclusive).
+# The sieve is only re-run when a caller asks for primes beyond _SIEVE_LIMIT.
+_SIEVE_PRIMES: List[int] = []
+_SIEVE_LIMIT = 0
+
+# Odd candidates per sieve segment: 256 KiB of flags, small enough to stay cache resident
+_SEGMENT_SIZE = 1 << 18
+
 
 class PrimesContribution:
+    @staticmethod
+    def primes_below(limit: int) -> Tuple[int, ...]:
+        """All primes p < limit (memoized, backed by a sieve that grows on demand)."""
+        return _primes_below_cached(limit)
+
+    @staticmethod
+    def prime_tables(limit: int, with_logs: bool = True) -> Tuple[Sequence[int], Sequence, Sequence]:
+        """
+        Primes p < limit together with their log p and sqrt p tables, so that callers
+        sweeping over sigma can build them once and slice them per call.
+        At mpmath.mp.dps <= 15 the tables are NumPy FP64 arrays, otherwise tuples of mpf.
+        Tables are memoized per (limit, precision) and must be treated as read-only.
+        With with_logs=False only the primes are built (log_p, sqrt_p = None), which is all
+        compute_gaussian() reads when uses_mpfr() is true.
+        """
+        if not with_logs:
+            return PrimesContribution.primes_below(limit), None, None
+        return _prime_tables(limit, mpmath.mp.prec, mpmath.mp.dps <= 15)
+
+    @staticmethod
+    def uses_mpfr() -> bool:
+        """
+        Whether compute_gaussian() runs on the gmpy2 MPFR kernel at the current precision.
+        That kernel takes log p and sqrt p from MPFR itself and ignores the tables.
+        """
+        return mpmath.mp.dps > 15 and weil_mpfr.HAVE_GMPY2
+
     @staticmethod
     def compute(f: Callable[[mpmath.mpf], mpmath.mpf], 
-                num_primes: int = 500) -> Tuple[mpmath.mpf, Dict[int, float]]:
-        
-        primes = list(primerange(2, num_primes))
-        w_primes = mpmath.mpf(0)
-        p_contributions = {}
-
-        for p in primes:
-            p_mp = mpmath.mpf(p)
-            log_p = mpmath.log(p_mp)
-            inner_sum = mpmath.mpf(0)
-
-            for m in range(1, 100):
-                p_power = p_mp ** (-mpmath.mpf(m) / 2)
-                u = mpmath.mpf(m) * log_p
-                term = p_power * (f(u) + f(-u))
-                inner_sum += term
-                
-                if abs(term) < mpmath.mpf(10) ** (-mpmath.mp.dps):
-                    break
-
-            # Делим на 2, чтобы убрать двойной учет симметрии f(u)+f(-u)
-            prime_term = log_p * (inner_sum / 2)
-            w_primes += prime_term
-            p_contributions[p] = float(prime_term)
-
-        return w_primes, p_contributions
+                num_primes: int = 500,
+                primes: Optional[Sequence[int]] = None,
+                log_p: Optional[Sequence[mpmath.mpf]] = None,
+                sqrt_p: Optional[Sequence[mpmath.mpf]] = None,
+                f_fp64: Optional[Callable[[float], float]] = None) -> Tuple[mpmath.mpf, np.ndarray, np.ndarray]:
+        """
+        Prime side of the Weil functional over primes p < num_primes, for an even test
+        function f (so f(u) + f(-u) = 2 f(u) and only one side is evaluated).
+        Precomputed (primes, log_p, sqrt_p) tables from prime_tables() may be passed instead;
+        if only primes is given, log_p and sqrt_p are computed from it.
+        If a double-precision f_fp64 is given, the tail terms of each prime (those too small
+        to need more than ~10 significant digits) are evaluated with it instead of mpmath.
+        For the Gaussian test function use compute_gaussian(), which never calls f.
+
+        Returns:
+            (W_primes, primes, contributions): the primes as an int64 array and the
+            per-prime contributions W_p as a float64 array aligned with it
+        """
+        if primes is None:
+            primes, log_p, sqrt_p = PrimesContribution.prime_tables(num_primes)
+        else:
+            log_p, sqrt_p = _complete_tables(primes, log_p, sqrt_p)
+
+        return _primes_sum(f, primes, log_p, sqrt_p, f_fp64)
+
+    @staticmethod
+    def compute_gaussian(sigma: float,
+                         num_primes: int = 500,
+                         primes: Optional[Sequence[int]] = None,
+                         log_p: Optional[Sequence[mpmath.mpf]] = None,
+                         sqrt_p: Optional[Sequence[mpmath.mpf]] = None) -> Tuple[mpmath.mpf, np.ndarray, np.ndarray]:
+        """
+        compute() for the Gaussian test function f(u) = exp(-(u / 2*sigma)^2) of
+        WeilFunctional.gaussian_testfunc, with the same arguments and return value.
+        At mpmath.mp.dps <= 15 the whole double loop runs in the compiled FP64 kernel of
+        weil_fp64. At higher precision the sum over m is bounded analytically where the terms
+        drop below 10^-dps, and if gmpy2 is installed the loop runs on MPFR numbers (weil_mpfr)
+        instead of mpf.
+        """
+        use_mpfr = PrimesContribution.uses_mpfr()
+        if primes is None:
+            primes, log_p, sqrt_p = PrimesContribution.prime_tables(num_primes, with_logs=not use_mpfr)
+        elif not use_mpfr:
+            log_p, sqrt_p = _complete_tables(primes, log_p, sqrt_p)
+
+        if mpmath.mp.dps <= 15:
+            # FP64 is enough at this precision: JIT kernel if available, else the NumPy grid
+            kernel = weil_fp64.primes_sum_gaussian if weil_fp64.HAVE_NUMBA else weil_fp64.primes_sum_gaussian_np
+            total, contributions = kernel(np.asarray(log_p, dtype=np.float64), float(sigma), 10.0 ** -mpmath.mp.dps)
+            return mpmath.mpf(total), np.asarray(primes, dtype=np.int64), contributions
+
+        if use_mpfr:
+            # Same loop at the same precision, on MPFR numbers instead of mpmath's pure-Python mpf
+            total, contributions = weil_mpfr.primes_sum_gaussian(primes, sigma, mpmath.mp.prec, mpmath.mp.dps)
+            return total, np.asarray(primes, dtype=np.int64), contributions
+
+        sigma = mpmath.mpf(sigma)
+        inv_two_sigma = 1 / (2 * sigma)
+        inv_two_sigma_d = float(inv_two_sigma)
+
+        def f(u):
+            return mpmath.exp(-(u * inv_two_sigma) ** 2)
+
+        def f_fp64(u):
+            return math.exp(-(u * inv_two_sigma_d) ** 2)
+
+        # Both p^(-m/2) and f(m log p) decay, and the terms stay >= 10^-dps only up to
+        # m log p = u_max, so the sum over m is bounded analytically instead of breaking on tol
+        u_max = weil_fp64.gaussian_u_cutoff(float(sigma), mpmath.mp.dps * math.log(10))
+        return _primes_sum(f, primes, log_p, sqrt_p, f_fp64, u_max)
+
+
+def _primes_sum(f, primes, log_p, sqrt_p, f_fp64=None, u_max=None):
+    """
+    The mpmath loop behind compute() and compute_gaussian(). The sum over m of each prime
+    stops once a term drops below 10^-dps, or at m log p > u_max if a bound is given.
+    """
+    # A term below 10^(10-dps) evaluated to 10 significant digits is already exact
+    # to the 10^-dps tolerance of the sum
+    f64_threshold = 10.0 ** (10 - mpmath.mp.dps)
+    # Terms below this no longer change the sum at the working precision
+    tol = mpmath.mpf(10) ** (-mpmath.mp.dps)
+
+    if mpmath.mp.dps <= 15:
+        # Doubles are exact at this precision: take log p and 1/sqrt p straight from FP64
+        # tables, with one vectorized reciprocal instead of an mpf division per prime
+        log_p = np.asarray(log_p, dtype=np.float64).tolist()
+        inv_sqrt = (1.0 / np.asarray(sqrt_p, dtype=np.float64)).tolist()
+    else:
+        inv_sqrt = None
+
+    prime_terms = []
+    contributions = np.empty(len(primes), dtype=np.float64)
+
+    for i in range(len(primes)):
+        log_p_i = mpmath.mpf(log_p[i])
+        inv_sqrt_p = mpmath.mpf(inv_sqrt[i]) if inv_sqrt is not None else 1 / mpmath.mpf(sqrt_p[i])
+        terms = []
+        use_f64 = False
+        # p^(-m/2) and m log p, advanced by one multiply / add per m instead of a power
+        p_power = mpmath.mpf(1)
+        u = mpmath.mpf(0)
+        m_max = 99 if u_max is None else min(99, int(u_max / float(log_p_i)) + 1)
+
+        for m in range(1, m_max + 1):
+            p_power *= inv_sqrt_p
+            u += log_p_i
+            term = None
+
+            if use_f64:
+                u_d = float(u)
+                term_d = float(p_power) * f_fp64(u_d)
+                if abs(term_d) < f64_threshold:
+                    term = term_d
+
+            if term is None:
+                term = p_power * f(u)
+                # Once the terms are this small, continue in double precision
+                use_f64 = f_fp64 is not None and abs(term) < f64_threshold
+
+            terms.append(term)
+
+            if u_max is None and abs(term) < tol:
+                break
+
+        # (f(u) + f(-u)) / 2 = f(u): the factor 2 from the symmetry cancels the halving
+        prime_term = log_p_i * mpmath.fsum(terms)
+        prime_terms.append(prime_term)
+        contributions[i] = prime_term
+
+    # fsum rounds once at the end instead of after every addition of a running accumulator
+    w_primes = mpmath.fsum(prime_terms)
+
+    return w_primes, np.asarray(primes, dtype=np.int64), contributions
+
+
+def _complete_tables(primes, log_p, sqrt_p):
+    """Fill in whichever of the log p / sqrt p tables the caller left out, in the format of prime_tables()."""
+    if mpmath.mp.dps <= 15:
+        values = np.asarray(primes, dtype=np.float64)
+        return (np.log(values) if log_p is None else log_p,
+                np.sqrt(values) if sqrt_p is None else sqrt_p)
+    return ([mpmath.log(p) for p in primes] if log_p is None else log_p,
+            [mpmath.sqrt(p) for p in primes] if sqrt_p is None else sqrt_p)
+
+
+@functools.lru_cache(maxsize=16)
+def _prime_tables(limit: int, prec: int, fp64: bool):
+    primes = PrimesContribution.primes_below(limit)
+    if fp64:
+        primes = np.array(primes, dtype=np.int64)
+        tables = (primes, np.log(primes), np.sqrt(primes))
+        for table in tables:
+            table.flags.writeable = False
+        return tables
+    with mpmath.workprec(prec):
+        return tuple(primes), tuple(mpmath.log(p) for p in primes), tuple(mpmath.sqrt(p) for p in primes)
+
+
+def _simple_sieve(limit: int) -> np.ndarray:
+    """Plain Sieve of Eratosthenes on a NumPy boolean array: all primes p < limit."""
+    is_prime = np.ones(max(limit, 2), dtype=bool)
+    is_prime[:2] = False
+    for i in range(2, math.isqrt(limit) + 1):
+        if is_prime[i]:
+            is_prime[i * i::i] = False
+    return np.flatnonzero(is_prime)
+
+
+def _sieve_segment(lo: int, hi: int, base_primes: List[int]) -> np.ndarray:
+    """Odd primes in [lo, hi) for odd lo, crossing off multiples of the odd base primes."""
+    segment = np.ones((hi - lo + 1) // 2, dtype=bool)
+
+    for p in base_primes:
+        if p * p >= hi:
+            break
+        # First odd multiple of p in [lo, hi) that is not p itself
+        start = max(p * p, -(-lo // p) * p)
+        if start % 2 == 0:
+            start += p
+        # Consecutive odd multiples are 2p apart, i.e. p slots apart
+        segment[(start - lo) // 2::p] = False
+
+    return lo + 2 * np.flatnonzero(segment)
+
+
+def _sieve(limit: int) -> List[int]:
+    """
+    Segmented Sieve of Eratosthenes: all primes p < limit.
+    Only odd numbers are stored (slot k of a segment starting at odd lo is lo + 2k), and
+    [3, limit) is processed in _SEGMENT_SIZE blocks so the working set stays in cache.
+    Segments are independent once the base primes are known, so with several cores they
+    are sieved on a thread pool (NumPy releases the GIL for the slice stores).
+    """
+    if limit <= 3:
+        return [2] if limit == 3 else []
+
+    base_primes = _simple_sieve(math.isqrt(limit - 1) + 1)[1:].tolist()
+    bounds = [(lo, min(lo + 2 * _SEGMENT_SIZE, limit)) for lo in range(3, limit, 2 * _SEGMENT_SIZE)]
+
+    num_workers = min(len(bounds), os.cpu_count() or 1)
+    if num_workers > 1:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            chunks = list(executor.map(lambda b: _sieve_segment(b[0], b[1], base_primes), bounds))
+    else:
+        chunks = [_sieve_segment(lo, hi, base_primes) for lo, hi in bounds]
+
+    return np.concatenate([np.array([2], dtype=np.int64)] + chunks).tolist()
+
+
+@functools.lru_cache(maxsize=None)
+def _primes_below_cached(limit: int) -> Tuple[int, ...]:
+    global _SIEVE_PRIMES, _SIEVE_LIMIT
+    if limit > _SIEVE_LIMIT:
+        # Grow geometrically so a sweep over increasing limits re-sieves only O(log) times
+        _SIEVE_LIMIT = max(2 * _SIEVE_LIMIT, limit)
+        _SIEVE_PRIMES = _sieve(_SIEVE_LIMIT)
+    return tuple(_SIEVE_PRIMES[:bisect.bisect_left(_SIEVE_PRIMES, limit)])
@@ -1,4 +1,8 @@
+import bisect
+import math
+
 import mpmath
+import numpy as np
 from typing import List
 
 
@@ -28,23 +32,36 @@ class ZerosContribution:
         Sums the contribution of all loaded gamma_n.
         
         Args:
-            gammas: List of imaginary parts of Riemann zeros (gamma_n)
+            gammas: List of imaginary parts of Riemann zeros (gamma_n), positive and sorted
+                ascending as RiemannZerosLoader returns them (NumPy arrays are sorted if needed)
             sigma: Width parameter for the Gaussian test function
             
         Returns:
             The sum of f_hat(gamma_n) over all n mapped.
         """
-        total = mpmath.mpf(0)
         sigma = mpmath.mpf(sigma)
-        
-        for i, gamma_n in enumerate(gammas):
-            f_hat_val = ZerosContribution.gaussian_fourier_transform(gamma_n, sigma)
-            total += f_hat_val
-            
-            # The test Gaussian decays EXTREMELY fast (exp(-sigma^2 t^2)).
-            # Thus, we can safely break early if f_hat_val underflows.
-            if f_hat_val < mpmath.mpf('1e-50'):
-                break
+
+        # The cutoff below relies on ascending order; only an array can be checked without a Python-level scan
+        if isinstance(gammas, np.ndarray) and np.any(gammas[1:] < gammas[:-1]):
+            gammas = np.sort(gammas)
+
+        # The test Gaussian decays EXTREMELY fast (exp(-sigma^2 t^2)): f_hat(t) < 1e-50 exactly when
+        # (sigma t)^2 > log(2 sigma sqrt(pi)) + 50 log(10). With gammas ascending, the live
+        # terms are the prefix below that analytic cutoff, found by bisection before any exp is taken.
+        prefactor = 2 * sigma * mpmath.sqrt(mpmath.pi)
+        t_max = float(mpmath.sqrt(50 * mpmath.log(10) + mpmath.log(prefactor)) / sigma)
+        gammas = gammas[:bisect.bisect_right(gammas, t_max)]
+
+        if mpmath.mp.dps <= 15:
+            # Double precision suffices: one vectorized exp over the live zeros
+            g = np.array([float(x) for x in gammas], dtype=np.float64)
+            s = float(sigma)
+            total = 2 * s * math.sqrt(math.pi) * np.exp(-(s * g) ** 2).sum()
+            return mpmath.mpf(2 * total)
+
+        # f_hat(t) = prefactor * exp(-sigma^2 t^2): only the exp varies per zero (single-rounding fsum)
+        s2 = sigma * sigma
+        total = prefactor * mpmath.fsum(mpmath.exp(-s2 * (gamma_n * gamma_n)) for gamma_n in gammas)
 
         # Assuming symmetry of Riemann zeros: gamma_{-n} = -gamma_n.
         # For our test function f_hat(t) = f_hat(-t), so the total sum includes both positive and negative zeros.
@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import mpmath
+import pytest
+
+import connection
+from connection import WeilGraphConnection
+
+
+@pytest.fixture
+def gammas():
+    return [mpmath.mpf(g) for g in ('14.134725141734693', '21.022039638771555', '25.010857580145688')]
+
+
+def test_robustness_pool_matches_serial(monkeypatch, gammas):
+    sigma_values = [0.1, 0.15, 0.2]
+    with mpmath.workdps(20):
+        monkeypatch.setattr(connection.os, 'cpu_count', lambda: 1)
+        serial = WeilGraphConnection.experiment_robustness(gammas, sigma_values=sigma_values)
+
+        monkeypatch.setattr(connection.os, 'cpu_count', lambda: 2)
+        pooled = WeilGraphConnection.experiment_robustness(gammas, sigma_values=sigma_values)
+
+    assert pooled == serial
+    assert serial['sigma_values'] == sigma_values
+    # The pool initializer only fills the workers' sweep state, never the caller's
+    assert connection._sweep_state == {}
+
+
+def test_resonance_deltas_match_direct_formula(gammas):
+    sigma = 1.0
+    with mpmath.workdps(15):
+        result = WeilGraphConnection.experiment_graph_weight_assignment(gammas, sigma=sigma, num_primes=30)
+
+    with mpmath.workdps(30):
+        gamma_1 = gammas[0]
+        expected = {}
+        for p in [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]:
+            p_mpf = mpmath.mpf(p)
+            log_p = mpmath.log(p_mpf)
+            f_log_p = mpmath.exp(-(log_p / (2 * sigma)) ** 2)
+            # Delta_p = Re[p^(i gamma_1') - p^(i gamma_1)] * (log p / sqrt p) * f(log p), gamma_1' = gamma_1 + 0.1i
+            wave_shift = p_mpf ** (1j * (gamma_1 + 0.1j)) - p_mpf ** (1j * gamma_1)
+            expected[p] = float(mpmath.re(wave_shift * (log_p / mpmath.sqrt(p_mpf)) * f_log_p))
+
+    prime_data = result['prime_data']
+    assert sorted(prime_data) == sorted(expected)
+    for p, delta in expected.items():
+        assert prime_data[p]['delta'] == pytest.approx(delta, rel=1e-12), f"p={p}"
+        assert prime_data[p]['w_broken'] == prime_data[p]['w_ideal'] + prime_data[p]['delta']
+
+    assert result['resonance_prime'] == max(expected, key=lambda p: abs(expected[p]))
@@ -2,6 +2,8 @@ import os
 import sys
 import unittest
 
+import numpy as np
+
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
 from bruhat_tits import BruhatTitsTree
@@ -21,9 +23,38 @@ class TestBruhatTitsTree(unittest.TestCase):
         self.assertEqual(graph.degree(0), p + 1)
         
         # Nodes at level 1 should have degree 3 (1 parent, 2 children)
-        for node, level in tree.node_level.items():
+        for node, level in enumerate(tree.node_level):
             if level == 1:
                 self.assertEqual(graph.degree(node), p + 1)
 
+    def test_edge_weights_from_weil(self):
+        tree = BruhatTitsTree(p=3, depth=2)
+
+        tree.assign_edge_weights_from_weil(0.25)
+        np.testing.assert_allclose(tree.edge_w, np.log(3))
+
+        tree.assign_edge_weights_from_weil(-0.5)
+        np.testing.assert_allclose(tree.edge_w, -0.5 * np.log(3))
+        self.assertEqual(tree.graph[0][1]['weight'], tree.edge_w[0])
+
+    def test_unitarity_violation_fraction(self):
+        tree = BruhatTitsTree(p=2, depth=2)
+        self.assertEqual(tree.measure_unitarity_violation(), 0.0)
+
+        tree.edge_w[:3] = -1.0
+        self.assertAlmostEqual(tree.measure_unitarity_violation(), 3 / 9)
+
+        # A bare root has no edges at all
+        self.assertEqual(BruhatTitsTree(p=2, depth=0).measure_unitarity_violation(), 0.0)
+
+    def test_with_weights_shares_topology(self):
+        tree = BruhatTitsTree(p=2, depth=3)
+        healthy = tree.with_weights(0.5)
+        broken = tree.with_weights(-0.5)
+
+        self.assertIs(healthy.edge_u, broken.edge_u)
+        self.assertEqual(healthy.measure_unitarity_violation(), 0.0)
+        self.assertEqual(broken.measure_unitarity_violation(), 1.0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,120 @@
+import math
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import mpmath
+import pytest
+
+import weil_fp64
+import weil_primes
+from weil_functional import WeilFunctional
+from weil_primes import PrimesContribution
+
+
+def _reference_primes(limit):
+    """Plain bytearray Sieve of Eratosthenes: all primes p < limit."""
+    flags = bytearray([1]) * max(limit, 2)
+    flags[:2] = b'\x00\x00'
+    for i in range(2, math.isqrt(max(limit - 1, 0)) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if flags[i]]
+
+
+@pytest.mark.parametrize("cpu_count", [1, 4])
+def test_segmented_sieve_matches_reference(monkeypatch, cpu_count):
+    # Segments hold 2^18 odd numbers starting at 3, so the first boundary is 3 + 2^19
+    monkeypatch.setattr(weil_primes.os, 'cpu_count', lambda: cpu_count)
+    boundary = 3 + 2 * weil_primes._SEGMENT_SIZE
+    limits = [2, 3, 4, 100, boundary - 1, boundary, boundary + 1, boundary + 2, 2 * boundary + 7]
+
+    for limit in limits:
+        assert weil_primes._sieve(limit) == _reference_primes(limit), f"limit={limit}"
+
+
+@pytest.mark.parametrize("sigma", [0.3, 1.0, 5.0])
+def test_gaussian_u_cutoff(sigma):
+    neg_log_tol = 30 * math.log(10)
+    u_max = weil_fp64.gaussian_u_cutoff(sigma, neg_log_tol)
+
+    def log_term(u):
+        return -0.5 * u - (u / (2 * sigma)) ** 2
+
+    # The bound is where the term exp(-u/2 - (u / 2*sigma)^2) equals tol exactly
+    assert math.isclose(log_term(u_max), -neg_log_tol, rel_tol=1e-12)
+
+    # so for p = 2 the last m kept by the loops is the first one below tol
+    log_2 = math.log(2)
+    m_max = int(u_max / log_2) + 1
+    assert log_term((m_max - 1) * log_2) >= -neg_log_tol
+    assert log_term(m_max * log_2) < -neg_log_tol
+
+
+@pytest.mark.parametrize("kernel", [weil_fp64.primes_sum_gaussian, weil_fp64.primes_sum_gaussian_np])
+@pytest.mark.parametrize("sigma", [0.3, 1.0, 2.0])
+def test_fp64_kernels_match_mpmath_loop(kernel, sigma):
+    with mpmath.workdps(30):
+        f, _ = WeilFunctional.gaussian_testfunc(sigma)
+        # The generic f runs the mpmath loop with its tolerance break
+        w_ref, primes, contributions_ref = PrimesContribution.compute(f, num_primes=2000)
+
+    log_p = np.log(primes.astype(np.float64))
+    total, contributions = kernel(log_p, sigma, 1e-15)
+
+    np.testing.assert_allclose(contributions, contributions_ref, rtol=1e-13, atol=1e-16)
+    assert math.isclose(total, float(w_ref), rel_tol=1e-13)
+
+
+@pytest.mark.parametrize("dps", [30, 50])
+@pytest.mark.parametrize("sigma", [0.5, 2.0])
+def test_mpfr_kernel_matches_mpmath_loop(dps, sigma):
+    pytest.importorskip("gmpy2")
+    import weil_mpfr
+
+    with mpmath.workdps(dps):
+        f, _ = WeilFunctional.gaussian_testfunc(sigma)
+        w_ref, primes, contributions_ref = PrimesContribution.compute(f, num_primes=2000)
+
+        total, contributions = weil_mpfr.primes_sum_gaussian(primes, mpmath.mpf(sigma), mpmath.mp.prec, dps)
+        assert abs(total - w_ref) <= mpmath.mpf(10) ** (3 - dps) * abs(w_ref)
+
+        # compute_gaussian() dispatches to the kernel, which needs no log p / sqrt p tables
+        assert PrimesContribution.uses_mpfr()
+        assert PrimesContribution.prime_tables(2000, with_logs=False)[1] is None
+        w_dispatch, _, _ = PrimesContribution.compute_gaussian(sigma, num_primes=2000)
+        assert w_dispatch == total
+
+    np.testing.assert_allclose(contributions, contributions_ref, rtol=1e-14, atol=1e-300)
+
+
+@pytest.mark.parametrize("dps", [15, 30])
+@pytest.mark.parametrize("sigma", [0.5, 2.0])
+def test_compute_gaussian_matches_generic_compute(dps, sigma):
+    with mpmath.workdps(dps):
+        f, _ = WeilFunctional.gaussian_testfunc(sigma)
+        w_ref, primes_ref, contributions_ref = PrimesContribution.compute(f, num_primes=2000)
+        w, primes, contributions = PrimesContribution.compute_gaussian(sigma, num_primes=2000)
+
+        assert abs(w - w_ref) <= mpmath.mpf(10) ** (2 - dps) * abs(w_ref)
+
+    np.testing.assert_array_equal(primes, primes_ref)
+    np.testing.assert_allclose(contributions, contributions_ref, rtol=1e-13, atol=1e-16)
+
+
+@pytest.mark.parametrize("dps", [15, 30])
+def test_compute_builds_missing_tables_from_primes(dps):
+    with mpmath.workdps(dps):
+        f, _ = WeilFunctional.gaussian_testfunc(1.0)
+        w_ref, _, contributions_ref = PrimesContribution.compute(f, num_primes=6)
+        w, primes, contributions = PrimesContribution.compute(f, primes=[2, 3, 5])
+        w_gauss, _, _ = PrimesContribution.compute_gaussian(1.0, primes=[2, 3, 5])
+
+        assert w == w_ref
+        assert abs(w_gauss - w_ref) <= mpmath.mpf(10) ** (2 - dps) * abs(w_ref)
+
+    np.testing.assert_array_equal(primes, [2, 3, 5])
+    np.testing.assert_array_equal(contributions, contributions_ref)
@@ -5,8 +5,12 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
 import mpmath
+import numpy as np
 from data_loader import RiemannZerosLoader
+from weil_archimedean import ArchimideanTerm
 from weil_functional import WeilFunctional
+from weil_primes import PrimesContribution
+from weil_zeros import ZerosContribution
 
 def test_baseline():
     """
@@ -30,6 +34,105 @@ def test_baseline():
         print(f"✓ sigma={sigma}: W = {w_float:.6e} >= 0")
 
 
+def test_archimedean_double_matches_quad():
+    """The FP64 Gauss-Legendre Archimedean term agrees with mpmath.quad over a wide sigma range."""
+    with mpmath.workdps(20):
+        for sigma in [0.01, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0]:
+            _, f_hat = WeilFunctional.gaussian_testfunc(sigma)
+            _, f_hat_np = WeilFunctional.gaussian_testfunc_np(sigma)
+
+            w_double = ArchimideanTerm.compute(f_hat, precision='double', f_hat_np=f_hat_np)
+            w_quad = ArchimideanTerm.compute(f_hat, precision='mpf')
+
+            assert abs(w_double - w_quad) <= 5e-13 * abs(w_quad), f"sigma={sigma}"
+
+
+def test_compute_cache(monkeypatch):
+    """Repeated WeilFunctional.compute calls hit the cache; any change to the zeros misses it."""
+    calls = []
+    compute_cached = WeilFunctional.compute_cached
+
+    def counting_compute_cached(*args, **kwargs):
+        calls.append(args)
+        return compute_cached(*args, **kwargs)
+
+    monkeypatch.setattr(WeilFunctional, 'compute_cached', staticmethod(counting_compute_cached))
+    WeilFunctional.clear_cache()
+
+    with mpmath.workdps(15):
+        gammas = np.array([14.134725141734693, 21.022039638771555, 25.010857580145688, 30.424876125859513])
+        w_first, components = WeilFunctional.compute(gammas, sigma=1.0, num_primes=100, verbose=False)
+        w_again, _ = WeilFunctional.compute(gammas, sigma=1.0, num_primes=100, verbose=False)
+        assert len(calls) == 1
+        assert w_again == w_first
+
+        # Cached arrays are handed out read-only
+        assert not components['p_contributions'].flags.writeable
+
+        # Same length and end points, different middle zero
+        shifted = gammas.copy()
+        shifted[1] += 0.5
+        WeilFunctional.compute(shifted, sigma=1.0, num_primes=100, verbose=False)
+        assert len(calls) == 2
+
+    WeilFunctional.clear_cache()
+
+
+def test_compute_cache_is_lru_bounded():
+    """The result cache keeps the _RESULTS_CACHE_SIZE most recently used entries under fixed-size keys."""
+    WeilFunctional.clear_cache()
+    cache = WeilFunctional._results_cache
+    size = WeilFunctional._RESULTS_CACHE_SIZE
+
+    with mpmath.workdps(15):
+        gammas = np.array([14.134725141734693, 21.022039638771555])
+        sigmas = [1 + i / 10 for i in range(size + 2)]
+        for sigma in sigmas[:size]:
+            WeilFunctional.compute(gammas, sigma=sigma, num_primes=50, verbose=False)
+        # A hit makes sigmas[0] the most recently used, so sigmas[1] and then sigmas[2] are evicted
+        WeilFunctional.compute(gammas, sigma=sigmas[0], num_primes=50, verbose=False)
+        for sigma in sigmas[size:]:
+            WeilFunctional.compute(gammas, sigma=sigma, num_primes=50, verbose=False)
+
+        assert len(cache) == size
+        assert WeilFunctional._cache_key(gammas, sigmas[0], 50) in cache
+        assert WeilFunctional._cache_key(gammas, sigmas[1], 50) not in cache
+        assert WeilFunctional._cache_key(gammas, sigmas[2], 50) not in cache
+
+    with mpmath.workdps(30):
+        # mpf zeros that round to the same doubles still get different digests
+        zeros = [mpmath.mpf('14.134725141734693790457251983562'), mpmath.mpf('21.022039638771554992628479593897')]
+        nudged = [zeros[0], zeros[1] + mpmath.mpf('1e-25')]
+        assert [float(g) for g in nudged] == [float(g) for g in zeros]
+        assert WeilFunctional._zeros_digest(nudged) != WeilFunctional._zeros_digest(zeros)
+        assert len(WeilFunctional._zeros_digest(zeros)) == 16
+
+    WeilFunctional.clear_cache()
+
+
+def test_num_primes_is_the_prime_limit():
+    """components['num_primes'] is the limit p < num_primes on both entry points, not the prime count."""
+    WeilFunctional.clear_cache()
+    with mpmath.workdps(15):
+        gammas = [mpmath.mpf('14.134725141734693'), mpmath.mpf('21.022039638771555')]
+        _, components = WeilFunctional.compute(gammas, sigma=1.0, num_primes=100, verbose=False)
+        tables = PrimesContribution.prime_tables(100)
+        _, components_cached = WeilFunctional.compute_cached(gammas, 1.0, 100, *tables)
+
+    assert components['num_primes'] == components_cached['num_primes'] == 100
+    assert len(components['primes']) == len(components_cached['primes']) == 25
+    WeilFunctional.clear_cache()
+
+
+def test_zeros_order_independent():
+    """W_zeros does not depend on the order a NumPy array of zeros comes in."""
+    gammas = np.array([14.134725141734693, 21.022039638771555, 25.010857580145688])
+    with mpmath.workdps(30):
+        expected = ZerosContribution.compute(gammas, sigma=0.1)
+        assert expected > 0
+        assert ZerosContribution.compute(gammas[::-1], sigma=0.1) == expected
+        assert ZerosContribution.compute(gammas[[1, 0, 2]], sigma=0.1) == expected
+
 if __name__ == "__main__":
     test_baseline()
     print("✓ All Weil functional tests passed.")
@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 
@@ -24,6 +25,54 @@ def test_zeros_loading():
     assert loader.verify_first_five(gammas)
 
 
+ZEROS = ['14.134725141734693790457251983562', '21.022039638771554992628479593897',
+         '25.010857580145688763213790992563']
+
+
+def test_json_cache_migrates_to_binary(tmp_path, monkeypatch):
+    monkeypatch.setattr(RiemannZerosLoader, 'DATA_DIR', str(tmp_path))
+    with open(tmp_path / "riemann_zeros.json", 'w') as f:
+        json.dump(ZEROS, f)
+
+    with mpmath.workdps(30):
+        gammas = RiemannZerosLoader.load_odlyzko(num_zeros=2, dps=30)
+        assert gammas == [mpmath.mpf(z) for z in ZEROS[:2]]
+
+        # All zeros of the JSON file were written to the binary cache, which is read first from now on
+        assert (tmp_path / "riemann_zeros.npy").exists()
+        assert (tmp_path / "riemann_zeros_hp.pkl").exists()
+        (tmp_path / "riemann_zeros.json").unlink()
+        assert RiemannZerosLoader.load_odlyzko(num_zeros=3, dps=30) == [mpmath.mpf(z) for z in ZEROS]
+
+
+def test_loader_returns_zeros_ascending(tmp_path, monkeypatch):
+    monkeypatch.setattr(RiemannZerosLoader, 'DATA_DIR', str(tmp_path))
+    with open(tmp_path / "riemann_zeros.json", 'w') as f:
+        json.dump(ZEROS[::-1], f)
+
+    with mpmath.workdps(30):
+        assert RiemannZerosLoader.load_odlyzko(num_zeros=3, dps=30) == [mpmath.mpf(z) for z in ZEROS]
+
+
+def test_binary_cache_round_trip(tmp_path):
+    cache_path = str(tmp_path / "riemann_zeros")
+    with mpmath.workdps(30):
+        gammas = [mpmath.mpf(z) for z in ZEROS]
+        RiemannZerosLoader._save_cache(gammas, cache_path)
+
+        # dps > 15: the pickled _mpf_ tuples give back the exact values
+        assert RiemannZerosLoader._load_cache(cache_path, 3, 30) == gammas
+
+    # A cache with fewer zeros than requested is skipped at either precision
+    assert RiemannZerosLoader._load_cache(cache_path, 4, 15) is None
+    assert RiemannZerosLoader._load_cache(cache_path, 4, 30) is None
+
+    # dps <= 15 reads the FP64 .npy array alone; higher precision never falls back to it
+    os.remove(cache_path + "_hp.pkl")
+    with mpmath.workdps(15):
+        assert RiemannZerosLoader._load_cache(cache_path, 2, 15) == [mpmath.mpf(float(g)) for g in gammas[:2]]
+    assert RiemannZerosLoader._load_cache(cache_path, 2, 30) is None
+
 if __name__ == "__main__":
     test_zeros_loading()
     print("✓ All data loader tests passed.")